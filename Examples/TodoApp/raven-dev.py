@@ -10,18 +10,30 @@ Usage:
 """
 
 import os
+import stat
 import sys
+import argparse
 import time
 import hashlib
 import subprocess
 import threading
 import signal
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import shutil
+import webbrowser
+import json
+import mimetypes
+import re
 from pathlib import Path
-from datetime import datetime
-from flask import Flask, send_from_directory, jsonify
-from flask_cors import CORS
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from flask import Flask, Response, abort, request
+from waitress import serve
+from werkzeug.utils import safe_join
+from werkzeug.wsgi import wrap_file
+from watchfiles import Change, watch
 
 # Configuration
 SWIFT_SDK = "swift-6.2.3-RELEASE_wasm"
@@ -30,6 +42,46 @@ APP_NAME = "TodoApp"
 SOURCE_DIRS = ["Sources", "../../Sources"]  # Watch app and framework sources
 PUBLIC_DIR = "public"
 BUILD_DIR = ".build"
+WASM_FILE = f"{APP_NAME}-v2.wasm"
+DEV_CACHE_FILE = ".raven-dev-cache"  # Persisted WASM hash across restarts
+HASH_CHUNK_SIZE = 1 << 20
+BUILD_TIMEOUT = 120  # seconds
+
+# Dev builds skip IndexStore writes and keep only line-table debug info;
+# incremental compilation stays on (no -wmo) so single-file edits are cheap.
+# Pin SwiftPM's native build system rather than the slower integrations.
+SWIFT_BUILD_ARGS = [
+    '--build-system', 'native',
+    '--disable-index-store',
+    '-Xswiftc', '-gline-tables-only',
+]
+# Each open tab holds one thread for its event stream; leave plenty of room
+# for several tabs plus the page/asset requests of a reload
+SERVER_THREADS = 32
+SSE_KEEPALIVE_SECONDS = 15
+SSE_POLL_SECONDS = 1  # How quickly a closed tab's stream releases its thread
+STATUS_ERROR_LINES = 20  # Most recent build error lines reported by /api/status
+STATUS_PUBLISH_SECONDS = 0.25  # Min interval between /api/status re-encodes mid-build
+
+mimetypes.add_type('application/wasm', '.wasm')
+
+# Per-route response headers, built once and passed to each Response as-is
+# (flask-cors is overkill for a fixed '*')
+CORS_HEADERS = [
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+    ('Access-Control-Allow-Headers', '*'),
+]
+# no-cache (not no-store): browsers keep the WASM but revalidate it on every
+# load, and get a 304 via its ETag unless a build replaced it
+WASM_HEADERS = [
+    ('Cache-Control', 'no-cache'),
+    *CORS_HEADERS,
+]
+SSE_HEADERS = [('Cache-Control', 'no-cache'), *CORS_HEADERS]
+
+# Matches build output lines containing "error:" (case-insensitive)
+ERROR_LINE_RE = re.compile(rb'error:', re.IGNORECASE)
 
 # Color codes for terminal output
 class Colors:
@@ -43,14 +95,131 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+class ColorFormatter(logging.Formatter):
+    """Prefix each line with a colored [HH:MM:SS] timestamp"""
+
+    COLORS = {
+        'info': Colors.OKCYAN,
+        'success': Colors.OKGREEN,
+        'warning': Colors.WARNING,
+        'error': Colors.FAIL,
+        'build': Colors.OKBLUE
+    }
+
+    def __init__(self):
+        super().__init__()
+        # Only the queue listener thread formats, so this needs no lock
+        self._stamp_second = None
+        self._stamp = ''
+
+    def format(self, record):
+        style = getattr(record, 'style', 'info')
+        if style == 'detail':
+            # Continuation lines (e.g. compiler errors) print as-is
+            return record.getMessage()
+
+        # Bursts of log lines share a second; render the stamp once per second
+        second = int(record.created)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp = time.strftime('%H:%M:%S', time.localtime(second))
+
+        color = self.COLORS.get(style, '')
+        return f"{color}[{self._stamp}]{Colors.ENDC} {record.getMessage()}"
+
+
+LOG_LEVELS = {
+    'info': logging.INFO,
+    'success': logging.INFO,
+    'build': logging.INFO,
+    'detail': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+# Callers (FS watcher, builder, request threads) only enqueue records; a
+# single listener thread does the formatting and the stdout write.
+logger = logging.getLogger('raven-dev')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(ColorFormatter())
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+
+# clonefile(2) from libSystem, for constant-time copy-on-write copies on APFS
+_clonefile = None
+if sys.platform == 'darwin':
+    import ctypes
+    _clonefile = getattr(ctypes.CDLL(None, use_errno=True), 'clonefile', None)
+
+
+def clone_file(src, dst):
+    """Copy src to dst, as a copy-on-write clone where the filesystem allows it.
+
+    Never a hard link: wasm-opt rewrites the staged file in place and SwiftPM
+    may reuse the build output's inode, so the two must not share data.
+    """
+    try:
+        os.unlink(dst)  # clonefile refuses an existing target
+    except FileNotFoundError:
+        pass
+
+    if _clonefile is not None:
+        # Fails across volumes; fall through to a plain copy then
+        if _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return
+    elif hasattr(os, 'copy_file_range'):
+        # Kernel-side copy (Linux); btrfs/XFS turn it into a reflink
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                else:
+                    return
+        except OSError:
+            pass  # e.g. EXDEV on older kernels
+
+    shutil.copyfile(src, dst)
+
+
+class DevFlask(Flask):
+    def make_default_options_response(self):
+        """Answer CORS preflights with 204 and the fixed CORS headers"""
+        response = super().make_default_options_response()
+        response.status_code = 204
+        response.headers.extend(CORS_HEADERS)
+        return response
+
+
 class RavenDevServer:
-    def __init__(self, port=8000):
+    def __init__(self, port=8000, release=False):
         self.port = port
-        self.app = Flask(__name__)
-        CORS(self.app)
+        self.release = release
+        self.app = DevFlask(__name__)
         self.building = False
         self.build_queued = False
-        self.last_wasm_hash = None
+        self._build_lock = threading.Lock()
+        self._hash_cache = self.load_hash_cache()  # (mtime_ns, size, hexdigest)
+        self.last_wasm_hash = self.get_wasm_hash()
+        self._static_cache = {}  # path -> (bytes, etag, mimetype)
+        self._build_proc = None  # Running swift build, killed on shutdown
+        # Error lines of the current/last build, filled while the build runs
+        self.build_errors = collections.deque(maxlen=STATUS_ERROR_LINES)
+        # Reload token handed to browsers; bumped (under the condition's lock)
+        # each time a new WASM is published. Seeded from the clock so tokens
+        # never repeat across restarts.
+        self._reload_cond = threading.Condition()
+        self.build_seq = int(time.time())
+        self.publish_status()
         self.setup_routes()
 
     def setup_routes(self):
@@ -58,231 +227,551 @@ class RavenDevServer:
 
         @self.app.route('/')
         def index():
-            return send_from_directory(PUBLIC_DIR, 'index.html')
+            return self.serve_static('index.html')
+
+        @self.app.route(f'/{WASM_FILE}')
+        def serve_wasm():
+            """Stream the WASM binary straight from disk via wsgi.file_wrapper"""
+            wasm_path = Path(PUBLIC_DIR) / WASM_FILE
+            try:
+                f = open(wasm_path, 'rb')
+            except FileNotFoundError:
+                abort(404)
+
+            # Builds swap the file in with os.replace, so (size, mtime_ns) of
+            # the open file identifies its content, as in serve_static
+            st = os.fstat(f.fileno())
+            etag = f"{st.st_size:x}-{st.st_mtime_ns:x}"
+            if etag in request.if_none_match:
+                f.close()
+                response = Response(status=304, headers=WASM_HEADERS)
+                response.set_etag(etag)
+                return response
+
+            response = Response(wrap_file(request.environ, f),
+                                mimetype='application/wasm',
+                                headers=WASM_HEADERS,
+                                direct_passthrough=True)
+            response.content_length = st.st_size
+            response.set_etag(etag)
+            return response
 
         @self.app.route('/<path:path>')
         def serve_file(path):
-            return send_from_directory(PUBLIC_DIR, path)
+            return self.serve_static(path)
 
         @self.app.route('/api/status')
         def status():
             """API endpoint to check if new WASM is available"""
-            return jsonify({
-                'building': self.building,
-                'wasm_hash': self.last_wasm_hash,
-                'timestamp': datetime.now().isoformat()
-            })
-
-        @self.app.after_request
-        def add_headers(response):
-            """Add cache control headers for WASM files"""
-            if response.mimetype == 'application/wasm':
-                response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                response.headers['Pragma'] = 'no-cache'
-                response.headers['Expires'] = '0'
-            # Add hot reload headers
-            response.headers['Access-Control-Allow-Origin'] = '*'
+            payload = self._status_building_payload if self.building else self._status_payload
+            return Response(payload, mimetype='application/json', headers=CORS_HEADERS)
+
+        @self.app.route('/api/events')
+        def events():
+            """Server-Sent Events stream that pushes the build_seq after each build"""
+            # Set by waitress (with channel_request_lookahead) once the
+            # client's socket is closed, e.g. when the tab reloads
+            disconnected = request.environ.get('waitress.client_disconnected', lambda: False)
+
+            def stream():
+                seen = None
+                idle = 0
+                while True:
+                    # Wait in short slices so a closed tab frees its worker
+                    # thread promptly instead of at the next failed write
+                    with self._reload_cond:
+                        self._reload_cond.wait_for(lambda: self.build_seq != seen,
+                                                   timeout=SSE_POLL_SECONDS)
+                        build_seq = self.build_seq
+
+                    if disconnected():
+                        return
+
+                    if build_seq == seen:
+                        idle += SSE_POLL_SECONDS
+                        if idle >= SSE_KEEPALIVE_SECONDS:
+                            # Comment line; keeps proxies from timing out the stream
+                            idle = 0
+                            yield b': keep-alive\n\n'
+                        continue
+
+                    seen = build_seq
+                    idle = 0
+                    yield f"data: {build_seq}\n\n".encode()
+
+            return Response(stream(), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+    def serve_static(self, path):
+        """Serve a file from PUBLIC_DIR out of the in-memory cache.
+
+        The ETag is derived from (size, mtime_ns), so one stat() both
+        revalidates the cached bytes and answers If-None-Match with a 304.
+        """
+        full_path = safe_join(PUBLIC_DIR, path)
+        if full_path is None:
+            abort(404)
+
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            abort(404)
+        if not stat.S_ISREG(st.st_mode):
+            abort(404)
+
+        etag = f"{st.st_size:x}-{st.st_mtime_ns:x}"
+        headers = WASM_HEADERS if path.endswith('.wasm') else CORS_HEADERS
+        if etag in request.if_none_match:
+            response = Response(status=304, headers=headers)
+            response.set_etag(etag)
             return response
 
+        entry = self._static_cache.get(path)
+        if entry is None or entry[1] != etag:
+            with open(full_path, 'rb') as f:
+                data = f.read()
+
+            mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            entry = (data, etag, mimetype)
+            self._static_cache[path] = entry
+
+        data, etag, mimetype = entry
+        response = Response(data, mimetype=mimetype, headers=headers)
+        response.set_etag(etag)
+        return response
+
+    def kill_active_build(self):
+        """Kill the running build's process group, if any"""
+        proc = self._build_proc
+        if proc is not None and proc.poll() is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def publish_status(self):
+        """Precompute /api/status bodies so polling never re-encodes JSON"""
+        def encode(building):
+            return json.dumps({
+                'building': building,
+                'build_seq': self.build_seq,
+                # Old polling snippets reload when this value changes
+                'wasm_hash': str(self.build_seq),
+                'errors': list(self.build_errors),
+            }, separators=(',', ':')).encode()
+
+        self._status_payload = encode(False)
+        self._status_building_payload = encode(True)
+
+    def load_hash_cache(self):
+        """Load the hash cache saved by a previous run, if any"""
+        try:
+            data = json.loads(Path(DEV_CACHE_FILE).read_text())
+            return (data['wasm_mtime_ns'], data['wasm_size'], data['wasm_hash'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save_hash_cache(self):
+        """Persist the hash cache so a restart doesn't re-hash the WASM"""
+        mtime_ns, size, digest = self._hash_cache
+        try:
+            Path(DEV_CACHE_FILE).write_text(json.dumps({
+                'wasm_mtime_ns': mtime_ns,
+                'wasm_size': size,
+                'wasm_hash': digest,
+            }))
+        except OSError as e:
+            self.log(f"⚠️  Could not write {DEV_CACHE_FILE}: {e}", 'warning')
+
     def get_wasm_hash(self):
-        """Get MD5 hash of current WASM file"""
-        wasm_path = Path(PUBLIC_DIR) / f"{APP_NAME}-v2.wasm"
-        if not wasm_path.exists():
+        """Get content hash of current WASM file (cached by mtime/size)"""
+        wasm_path = Path(PUBLIC_DIR) / WASM_FILE
+        try:
+            st = wasm_path.stat()
+        except FileNotFoundError:
             return None
 
-        with open(wasm_path, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+        cache = self._hash_cache
+        if cache and cache[0] == st.st_mtime_ns and cache[1] == st.st_size:
+            return cache[2]
 
-    def log(self, message, level='info'):
-        """Colored logging"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-
-        colors = {
-            'info': Colors.OKCYAN,
-            'success': Colors.OKGREEN,
-            'warning': Colors.WARNING,
-            'error': Colors.FAIL,
-            'build': Colors.OKBLUE
-        }
+        # Only used as a cache-bust tag, so a fast non-cryptographic digest
+        # is fine. Stream in 1MB chunks through one reused buffer instead of
+        # reading the whole file (or allocating a bytes object per chunk).
+        h = hashlib.blake2b(digest_size=8)
+        buf = memoryview(bytearray(HASH_CHUNK_SIZE))
+        with open(wasm_path, 'rb', buffering=0) as f:
+            while n := f.readinto(buf):
+                h.update(buf[:n])
 
-        color = colors.get(level, '')
-        print(f"{color}[{timestamp}]{Colors.ENDC} {message}")
+        digest = h.hexdigest()
+        self._hash_cache = (st.st_mtime_ns, st.st_size, digest)
+        self.save_hash_cache()
+        return digest
+
+    def log(self, message, level='info'):
+        """Colored logging (formatted off-thread by the queue listener)"""
+        logger.log(LOG_LEVELS.get(level, logging.INFO), message, extra={'style': level})
 
     def build_wasm(self):
-        """Build WASM binary using Swift"""
-        if self.building:
-            self.build_queued = True
-            return
+        """Build WASM binary using Swift, coalescing concurrent requests.
+
+        A call made while a build is running just marks one more build as
+        queued; the running builder picks it up on the same thread.
+        """
+        with self._build_lock:
+            if self.building:
+                self.build_queued = True
+                return None
+            self.building = True
 
-        self.building = True
+        try:
+            while True:
+                ok = self._do_build()
+                with self._build_lock:
+                    if not self.build_queued:
+                        self.building = False
+                        return ok
+                    self.build_queued = False
+                self.log("🔄 Running queued build...", 'info')
+        except BaseException:
+            with self._build_lock:
+                self.building = False
+                self.build_queued = False
+            raise
+
+    def _do_build(self):
+        """Run one swift build and publish the result"""
         self.log(f"🔨 Building {APP_NAME}.wasm...", 'build')
 
         try:
+            # A new build starts with a clean /api/status error list
+            self.build_errors.clear()
+            self.publish_status()
+
             # Run swift build
             start_time = time.time()
             # Use swiftly so the WASM toolchain/sdk is available even when the
-            # system Swift toolchain can't target wasm32.
-            result = subprocess.run(
-                ['swiftly', 'run', 'swift', 'build', '--swift-sdk', SWIFT_SDK],
-                capture_output=True,
-                text=True,
-                timeout=120
+            # system Swift toolchain can't target wasm32. Output is drained
+            # line by line so memory stays bounded however much it prints.
+            # Own session, so the timeout can kill swift build and its
+            # compiler children too: they inherit the stdout pipe, and the
+            # read loop below only ends once every writer is gone.
+            proc = subprocess.Popen(
+                ['swiftly', 'run', 'swift', 'build', '--swift-sdk', SWIFT_SDK, *SWIFT_BUILD_ARGS],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
             )
+            self._build_proc = proc
+            timed_out = threading.Event()
+
+            def kill_build():
+                timed_out.set()
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+            timer = threading.Timer(BUILD_TIMEOUT, kill_build)
+            timer.daemon = True
+            timer.start()
+
+            errors = []
+            error_count = 0
+            last_publish = 0.0
+            try:
+                for line in proc.stdout:
+                    # Show only errors, not warnings (first 5 are kept)
+                    if ERROR_LINE_RE.search(line):
+                        error_count += 1
+                        if len(errors) < 5:
+                            errors.append(line.rstrip())
+                        self.build_errors.append(line.rstrip().decode('utf-8', 'replace'))
+                        # Show errors on /api/status live, but throttle the
+                        # re-encode: a broken build can print thousands
+                        now = time.monotonic()
+                        if error_count == 1 or now - last_publish >= STATUS_PUBLISH_SECONDS:
+                            self.publish_status()
+                            last_publish = now
+                returncode = proc.wait()
+                if error_count:
+                    self.publish_status()
+            finally:
+                timer.cancel()
+                # Interrupted (e.g. Ctrl+C): don't leave the group holding
+                # the .build lock
+                if proc.poll() is None:
+                    self.kill_active_build()
+                    proc.wait()
+                self._build_proc = None
+                proc.stdout.close()
 
             build_time = time.time() - start_time
 
-            if result.returncode != 0:
+            if timed_out.is_set():
+                self.log(f"❌ Build timeout ({BUILD_TIMEOUT}s)", 'error')
+                return False
+
+            if returncode != 0:
                 self.log(f"❌ Build failed ({build_time:.1f}s)", 'error')
-                # Show only errors, not warnings
-                errors = [line for line in result.stderr.split('\n')
-                         if 'error:' in line.lower()]
-                for error in errors[:5]:  # Show first 5 errors
-                    print(f"  {error}")
-                if len(errors) > 5:
-                    print(f"  ... and {len(errors) - 5} more errors")
+                for error in errors:
+                    self.log(f"  {error.decode('utf-8', 'replace')}", 'detail')
+                if error_count > 5:
+                    self.log(f"  ... and {error_count - 5} more errors", 'detail')
                 return False
 
             # Copy WASM to public directory
             wasm_src = Path(BUILD_DIR) / WASM_TARGET / f"{APP_NAME}.wasm"
-            wasm_dst = Path(PUBLIC_DIR) / f"{APP_NAME}-v2.wasm"
+            wasm_dst = Path(PUBLIC_DIR) / WASM_FILE
 
             if not wasm_src.exists():
                 self.log(f"❌ WASM file not found: {wasm_src}", 'error')
                 return False
 
-            # Copy file
-            import shutil
-            shutil.copy2(wasm_src, wasm_dst)
+            # Stage next to the target and swap it in atomically so an
+            # in-flight GET never sees a half-written file
+            wasm_tmp = wasm_dst.with_suffix('.wasm.tmp')
+            clone_file(wasm_src, wasm_tmp)
 
-            # Update hash
-            new_hash = self.get_wasm_hash()
-            size_mb = wasm_dst.stat().st_size / (1024 * 1024)
+            # Size/opt passes are release-only; they are pure latency in dev
+            if self.release:
+                self.log("🗜️  Running wasm-opt -Oz...", 'build')
+                # wasm-opt writes the module to -o; only stderr is worth keeping
+                subprocess.run(['wasm-opt', '-Oz', str(wasm_tmp), '-o', str(wasm_tmp)],
+                               check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+            os.replace(wasm_tmp, wasm_dst)
 
+            # Publish first so browsers start fetching while we hash
+            with self._reload_cond:
+                self.build_seq += 1
+                self.publish_status()
+                self._reload_cond.notify_all()
+
+            size_mb = wasm_dst.stat().st_size / (1024 * 1024)
             self.log(f"✅ Build successful ({build_time:.1f}s, {size_mb:.1f}MB)", 'success')
-            self.log(f"   Hash: {new_hash[:8]}...", 'info')
 
-            self.last_wasm_hash = new_hash
+            # The hash is only informational now, off the reload path
+            self.last_wasm_hash = self.get_wasm_hash()
+            self.log(f"   Hash: {self.last_wasm_hash[:8]}...", 'info')
             return True
 
-        except subprocess.TimeoutExpired:
-            self.log("❌ Build timeout (120s)", 'error')
+        except subprocess.CalledProcessError as e:
+            self.log(f"❌ {e.cmd[0]} failed (exit {e.returncode})", 'error')
+            for line in (e.stderr or b'').decode('utf-8', 'replace').splitlines()[:5]:
+                self.log(f"  {line}", 'detail')
             return False
+
         except Exception as e:
             self.log(f"❌ Build error: {e}", 'error')
             return False
-        finally:
-            self.building = False
-
-            # Check if another build was queued
-            if self.build_queued:
-                self.build_queued = False
-                self.log("🔄 Running queued build...", 'info')
-                threading.Thread(target=self.build_wasm, daemon=True).start()
 
     def run(self):
         """Start the development server"""
         self.log(f"🚀 Raven Dev Server starting on port {self.port}", 'success')
-        self.app.run(host='0.0.0.0', port=self.port, debug=False, use_reloader=False)
+        # channel_request_lookahead keeps waitress reading the socket during a
+        # request, which is what makes waitress.client_disconnected work
+        serve(self.app, host='0.0.0.0', port=self.port, threads=SERVER_THREADS,
+              channel_request_lookahead=1)
 
 
-class SourceWatcher(FileSystemEventHandler):
+class SourceWatcher:
     """Watch source files for changes"""
 
-    def __init__(self, dev_server):
+    def __init__(self, dev_server, source_dirs):
         self.dev_server = dev_server
-        self.last_build = 0
-        self.debounce_seconds = 1.0  # Wait 1s after last change
-
-    def should_trigger_build(self, path):
-        """Check if file change should trigger rebuild"""
-        # Only watch .swift files
+        self.source_dirs = source_dirs
+        self.debounce_ms = 300  # Build 300ms after the last change
+        self.max_wait_ms = 1500  # ...but never wait longer than this
+        # Root prefixes, so the hidden-path check only looks below a root
+        self._root_prefixes = tuple(root.rstrip(os.sep) + os.sep for root in source_dirs)
+        # Every source file currently on disk; events for these are a set lookup
+        self.tracked = {
+            path
+            for source_dir in source_dirs
+            for path in self.collect_sources(source_dir)
+        }
+        # Content digests of the sources the last successful build saw
+        self._content_hashes = {path: self.content_hash(path) for path in self.tracked}
+
+    @staticmethod
+    def collect_sources(root):
+        """Paths of the .swift files below root, pruning hidden directories"""
+        found = []
+        stack = [root]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    # Skips .build/.git/.swiftpm at the directory, not per file
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.swift'):
+                        found.append(entry.path)
+        return found
+
+    def is_source_path(self, path):
+        """A .swift file with no hidden component (.build, .git, editor temp files) below its root"""
         if not path.endswith('.swift'):
             return False
+        for prefix in self._root_prefixes:
+            if path.startswith(prefix):
+                return (os.sep + '.') not in path[len(prefix) - 1:]
+        return False
 
-        # Ignore hidden files and build artifacts
-        if '/.build/' in path or '/.' in path:
-            return False
-
-        # Debounce: wait for changes to settle
-        now = time.time()
-        if now - self.last_build < self.debounce_seconds:
-            return False
-
-        return True
-
-    def on_modified(self, event):
-        if event.is_directory:
-            return
+    def should_trigger_build(self, change, path):
+        """Check if file change should trigger rebuild"""
+        # Only files not seen before need the full path check. Any non-delete
+        # counts as "seen": FSEvents may report a new file as modified.
+        return path in self.tracked or (change != Change.deleted and self.is_source_path(path))
 
-        if self.should_trigger_build(event.src_path):
-            self.last_build = time.time()
-            self.dev_server.log(f"📝 Changed: {Path(event.src_path).name}", 'info')
+    @staticmethod
+    def content_hash(path):
+        """Digest of a source file's bytes, or None if it is gone"""
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.blake2b(f.read(), digest_size=16).digest()
+        except FileNotFoundError:
+            return None
 
-            # Trigger rebuild in background
-            threading.Thread(target=self.dev_server.build_wasm, daemon=True).start()
+    def run(self, stop_event):
+        """Rebuild once per debounced batch of changes until stop_event is set"""
+        # watchfiles coalesces events natively: `step` is the quiet period,
+        # `debounce` caps how long a batch may keep growing.
+        for changes in watch(*self.source_dirs,
+                             watch_filter=self.should_trigger_build,
+                             step=self.debounce_ms,
+                             debounce=self.max_wait_ms,
+                             stop_event=stop_event):
+            # Editors often rewrite files with identical bytes on save;
+            # only build when some file's content actually differs
+            edited = {}
+            for change, path in changes:
+                if change == Change.deleted:
+                    self.tracked.discard(path)
+                else:
+                    self.tracked.add(path)
+                digest = self.content_hash(path)
+                if digest != self._content_hashes.get(path):
+                    edited[path] = digest
+
+            if not edited:
+                continue
+
+            names = sorted(path.rpartition(os.sep)[2] for path in edited)
+            self.dev_server.log(f"📝 Changed: {', '.join(names)}", 'info')
+
+            # Record the new digests only once a build succeeds, so a failed
+            # build is retried on the next real edit
+            if self.dev_server.build_wasm():
+                for path, digest in edited.items():
+                    if digest is None:
+                        self._content_hashes.pop(path, None)
+                    else:
+                        self._content_hashes[path] = digest
+
+
+HOT_RELOAD_SCRIPT = """
+    <!-- Raven Hot Reload -->
+    <script id="raven-hot-reload">
+    (function() {
+        let lastSeq = null;
+        const events = new EventSource('/api/events');
+
+        // The server sends the current build_seq on connect (and on
+        // reconnect after a restart), then again whenever a build finishes.
+        events.onmessage = (e) => {
+            const seq = Number(e.data);
+            if (lastSeq === null) {
+                lastSeq = seq;
+                console.log('🔥 Hot reload active, build:', seq);
+                return;
+            }
+
+            if (seq !== lastSeq) {
+                console.log('🔄 New build detected, reloading...');
+                window.location.reload();
+            }
+        };
+        events.onerror = () => console.error('Hot reload connection lost, retrying...');
+    })();
+    </script>
+    <!-- /Raven Hot Reload -->
+    """.encode()
 
-    def on_created(self, event):
-        self.on_modified(event)
+HOT_RELOAD_MARKER = b'<!-- Raven Hot Reload -->'
+# Only the SSE snippet has an end marker; older polling snippets lack it
+HOT_RELOAD_END_MARKER = b'<!-- /Raven Hot Reload -->'
+# Matches an injected block; older blocks ended at </script> with no end marker
+HOT_RELOAD_BLOCK_RE = re.compile(
+    rb'<!-- Raven Hot Reload -->.*?</script>(?:\s*<!-- /Raven Hot Reload -->)?',
+    re.DOTALL)
 
 
-def inject_hot_reload_script():
-    """Inject hot reload script into index.html if not present"""
+def inject_hot_reload_script(reinject=False):
+    """Inject hot reload script into index.html if not present (or refresh it)"""
     index_path = Path(PUBLIC_DIR) / 'index.html'
 
-    if not index_path.exists():
+    # Work on raw bytes; there is no need to decode the HTML
+    try:
+        content = index_path.read_bytes()
+    except FileNotFoundError:
         return
 
-    content = index_path.read_text()
+    # Check if already injected. Legacy polling snippets are always replaced,
+    # since they reload on a status field this server no longer drives.
+    if HOT_RELOAD_MARKER in content:
+        if not reinject and HOT_RELOAD_END_MARKER in content:
+            return
 
-    # Check if already injected
-    if 'raven-hot-reload' in content:
+        block = HOT_RELOAD_SCRIPT.strip()
+        updated = HOT_RELOAD_BLOCK_RE.sub(lambda m: block, content, count=1)
+        if updated != content:
+            index_path.write_bytes(updated)
+            print(f"{Colors.OKGREEN}✓{Colors.ENDC} Hot reload script updated in index.html")
         return
 
-    hot_reload_script = """
-    <!-- Raven Hot Reload -->
-    <script id="raven-hot-reload">
-    (function() {
-        let lastHash = null;
-
-        function checkForUpdates() {
-            fetch('/api/status')
-                .then(r => r.json())
-                .then(data => {
-                    if (lastHash === null) {
-                        lastHash = data.wasm_hash;
-                        console.log('🔥 Hot reload active, hash:', lastHash?.substring(0, 8));
-                        return;
-                    }
-
-                    if (data.wasm_hash && data.wasm_hash !== lastHash) {
-                        console.log('🔄 New build detected, reloading...');
-                        window.location.reload();
-                    }
-                })
-                .catch(err => console.error('Hot reload check failed:', err));
-        }
+    # Inject before closing body tag (one scan finds and splices it)
+    body_end = content.find(b'</body>')
+    if body_end != -1:
+        index_path.write_bytes(content[:body_end] + HOT_RELOAD_SCRIPT + b'\n' + content[body_end:])
+        print(f"{Colors.OKGREEN}✓{Colors.ENDC} Hot reload script injected into index.html")
 
-        // Check every 2 seconds
-        setInterval(checkForUpdates, 2000);
-        checkForUpdates();
-    })();
-    </script>
-    """
 
-    # Inject before closing body tag
-    if '</body>' in content:
-        content = content.replace('</body>', hot_reload_script + '\n</body>')
-        index_path.write_text(content)
-        print(f"{Colors.OKGREEN}✓{Colors.ENDC} Hot reload script injected into index.html")
+def swift_sdk_installed():
+    """Check for the WASM SDK, trying a stat before spawning `swift sdk list`"""
+    # SwiftPM's per-user SDK store: ~/Library/org.swift.swiftpm on macOS,
+    # ~/.swiftpm elsewhere (older toolchains used it on macOS too)
+    home = Path.home()
+    for sdk_dir in (home / 'Library' / 'org.swift.swiftpm' / 'swift-sdks',
+                    home / '.swiftpm' / 'swift-sdks'):
+        if any(sdk_dir.glob(f'{SWIFT_SDK}*')):
+            return True
 
+    result = subprocess.run(['swift', 'sdk', 'list'], capture_output=True, text=True)
+    return SWIFT_SDK in result.stdout
 
-def main():
-    import argparse
 
+READY_BANNER = (
+    f"\n{Colors.BOLD}{Colors.OKGREEN}✓ Ready!{Colors.ENDC}\n"
+    f"{Colors.OKCYAN}  • Edit .swift files to trigger rebuild{Colors.ENDC}\n"
+    f"{Colors.OKCYAN}  • Browser will auto-reload on changes{Colors.ENDC}\n"
+    f"{Colors.OKCYAN}  • Press Ctrl+C to stop{Colors.ENDC}\n\n"
+)
+
+
+def main():
     parser = argparse.ArgumentParser(description='Raven development server with hot reloading')
     parser.add_argument('--port', type=int, default=8000, help='Port to serve on (default: 8000)')
     parser.add_argument('--no-browser', action='store_true', help='Don\'t open browser automatically')
     parser.add_argument('--no-initial-build', action='store_true', help='Skip initial build')
+    parser.add_argument('--release', action='store_true', help='Run wasm-opt -Oz on each build')
+    parser.add_argument('--reinject', action='store_true', help='Replace an existing hot reload script in index.html')
 
     args = parser.parse_args()
 
@@ -292,8 +781,7 @@ def main():
         sys.exit(1)
 
     # Check Swift SDK
-    result = subprocess.run(['swift', 'sdk', 'list'], capture_output=True, text=True)
-    if SWIFT_SDK not in result.stdout:
+    if not swift_sdk_installed():
         print(f"{Colors.FAIL}Error: {SWIFT_SDK} not found{Colors.ENDC}")
         print(f"Install with: swift sdk install <URL>")
         sys.exit(1)
@@ -302,10 +790,12 @@ def main():
     Path(PUBLIC_DIR).mkdir(exist_ok=True)
 
     # Inject hot reload script
-    inject_hot_reload_script()
+    inject_hot_reload_script(reinject=args.reinject)
 
     # Create dev server
-    dev_server = RavenDevServer(port=args.port)
+    dev_server = RavenDevServer(port=args.port, release=args.release)
+    # The watcher thread is a daemon, so its build's finally never runs on exit
+    atexit.register(dev_server.kill_active_build)
 
     # Initial build
     if not args.no_initial_build:
@@ -314,36 +804,35 @@ def main():
             print(f"\n{Colors.WARNING}⚠️  Initial build failed, but starting server anyway{Colors.ENDC}")
 
     # Setup file watcher
-    event_handler = SourceWatcher(dev_server)
-    observer = Observer()
-
-    for source_dir in SOURCE_DIRS:
-        if Path(source_dir).exists():
-            observer.schedule(event_handler, source_dir, recursive=True)
-            print(f"{Colors.OKCYAN}👀 Watching:{Colors.ENDC} {source_dir}")
+    watch_dirs = [d for d in SOURCE_DIRS if Path(d).exists()]
+    sys.stdout.write(''.join(f"{Colors.OKCYAN}👀 Watching:{Colors.ENDC} {d}\n" for d in watch_dirs))
 
-    observer.start()
+    # Absolute roots so event paths line up with the content-hash keys
+    watcher = SourceWatcher(dev_server, [str(Path(d).resolve()) for d in watch_dirs])
+    stop_event = threading.Event()
+    watch_thread = threading.Thread(target=watcher.run, args=(stop_event,), daemon=True)
+    watch_thread.start()
 
     # Handle Ctrl+C gracefully
     def signal_handler(sig, frame):
         print(f"\n\n{Colors.OKCYAN}🛑 Shutting down...{Colors.ENDC}")
-        observer.stop()
-        observer.join()
+        stop_event.set()
+        dev_server.kill_active_build()
+        watch_thread.join(timeout=2)
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
 
     # Open browser
     if not args.no_browser:
-        import webbrowser
         url = f"http://localhost:{args.port}"
         print(f"\n{Colors.OKGREEN}🌐 Opening browser:{Colors.ENDC} {url}\n")
         threading.Timer(1.0, lambda: webbrowser.open(url)).start()
 
-    print(f"\n{Colors.BOLD}{Colors.OKGREEN}✓ Ready!{Colors.ENDC}")
-    print(f"{Colors.OKCYAN}  • Edit .swift files to trigger rebuild{Colors.ENDC}")
-    print(f"{Colors.OKCYAN}  • Browser will auto-reload on changes{Colors.ENDC}")
-    print(f"{Colors.OKCYAN}  • Press Ctrl+C to stop{Colors.ENDC}\n")
+    # One write, so log lines from the watcher/build threads can't split it
+    sys.stdout.write(READY_BANNER)
+    sys.stdout.flush()
 
     # Start server (blocking)
     try:
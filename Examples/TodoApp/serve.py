@@ -1,14 +1,14 @@
 from flask import Flask, send_from_directory
+from waitress import serve
 
 app = Flask(__name__)
 
-@app.after_request
-def add_header(response):
-    if response.mimetype == 'application/wasm':
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-    return response
+# Attached by serve_file to .wasm responses only
+WASM_HEADERS = {
+    'Cache-Control': 'no-cache, no-store, must-revalidate',
+    'Pragma': 'no-cache',
+    'Expires': '0',
+}
 
 @app.route('/')
 def index():
@@ -16,7 +16,12 @@ def index():
 
 @app.route('/<path:path>')
 def serve_file(path):
-    return send_from_directory('public', path)
+    response = send_from_directory('public', path)
+    if path.endswith('.wasm'):
+        response.headers.update(WASM_HEADERS)
+    return response
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000)
+    # waitress hands send_from_directory a wsgi.file_wrapper, so the WASM is
+    # streamed from disk instead of through the single-threaded dev server
+    serve(app, host='0.0.0.0', port=8000, threads=4)
@@ -14,10 +14,15 @@ Outputs:
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import dataclasses
+import functools
+import io
 import json
+import os
 import pathlib
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -26,31 +31,48 @@ from collections import deque
 from datetime import datetime, timezone
 from typing import Any
 
+try:  # Optional: much faster parsing of the (large) digester dump.
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
-TYPE_DECL_KINDS = {"Struct", "Class", "Enum", "Protocol", "TypeAlias"}
-API_DECL_KINDS = {"Func", "Var", "Subscript", "Constructor", "Macro"}
+
+TYPE_DECL_KINDS = frozenset({"Struct", "Class", "Enum", "Protocol", "TypeAlias"})
+API_DECL_KINDS = frozenset({"Func", "Var", "Subscript", "Constructor", "Macro"})
 TARGET_DECL_KINDS = TYPE_DECL_KINDS | API_DECL_KINDS
 SCORABLE_DECL_KINDS = TARGET_DECL_KINDS
+# Member kinds eligible for the actionable missing-API list.
+NAMED_API_DECL_KINDS = frozenset({"Func", "Var", "Subscript"})
+NOISE_MEMBER_DECL_KINDS = frozenset({"Func", "Var"})
+COMPONENT_DECL_KINDS = frozenset({"Struct", "Class", "Protocol"})
+
+NOISE_TYPEALIASES = frozenset(
+    {
+        "Body",
+        "AnimatableData",
+        "ArrayLiteralElement",
+        "RawValue",
+        "Element",
+        "Iterator",
+        "AllCases",
+    }
+)
+
+NOISE_MEMBERS = frozenset(
+    {
+        "body",
+        "hash",
+        "hashValue",
+        "rawValue",
+    }
+)
 
-NOISE_TYPEALIASES = {
-    "Body",
-    "AnimatableData",
-    "ArrayLiteralElement",
-    "RawValue",
-    "Element",
-    "Iterator",
-    "AllCases",
-}
 
-NOISE_MEMBERS = {
-    "body",
-    "hash",
-    "hashValue",
-    "rawValue",
-}
+# __slots__ keeps the (very large) symbol list compact; dataclass(slots=) needs 3.10+.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, **_DATACLASS_SLOTS)
 class SwiftUISymbol:
     usr: str
     decl_kind: str
@@ -59,6 +81,17 @@ class SwiftUISymbol:
     module_name: str
     path: tuple[str, ...]
 
+    def to_dict(self) -> dict[str, Any]:
+        # Flat equivalent of dataclasses.asdict() without its recursive deepcopy.
+        return {
+            "usr": self.usr,
+            "decl_kind": self.decl_kind,
+            "name": self.name,
+            "printed_name": self.printed_name,
+            "module_name": self.module_name,
+            "path": list(self.path),
+        }
+
 
 def owner_context(sym: SwiftUISymbol) -> str:
     # Path contains nested context from digester root down to symbol.
@@ -69,8 +102,10 @@ def owner_context(sym: SwiftUISymbol) -> str:
 
 
 def is_named_api(sym: SwiftUISymbol) -> bool:
-    # Keep identifiers that are easy to map to implementation tasks.
-    return bool(re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", sym.name))
+    # Keep identifiers that are easy to map to implementation tasks. For ASCII
+    # strings isidentifier() is exactly [A-Za-z_][A-Za-z0-9_]*.
+    name = sym.name
+    return name.isascii() and name.isidentifier()
 
 
 def qualified_member(owner: str, member: str) -> str:
@@ -83,7 +118,7 @@ def is_actionable_symbol(sym: SwiftUISymbol) -> bool:
         return False
     if sym.decl_kind == "TypeAlias" and sym.name in NOISE_TYPEALIASES:
         return False
-    if sym.decl_kind in {"Func", "Var"} and sym.name in NOISE_MEMBERS:
+    if sym.decl_kind in NOISE_MEMBER_DECL_KINDS and sym.name in NOISE_MEMBERS:
         return False
     # Operator-like overloads are rarely actionable in parity planning.
     if sym.decl_kind == "Func" and not is_named_api(sym):
@@ -91,27 +126,31 @@ def is_actionable_symbol(sym: SwiftUISymbol) -> bool:
     return True
 
 
-def run(cmd: list[str], cwd: pathlib.Path | None = None) -> str:
+def run(cmd: list[str], cwd: pathlib.Path | None = None, capture_stdout: bool = True) -> str:
     proc = subprocess.run(
         cmd,
         cwd=str(cwd) if cwd else None,
         text=True,
-        capture_output=True,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         check=False,
     )
+    stdout = proc.stdout or ""
     if proc.returncode != 0:
         raise RuntimeError(
             f"Command failed ({proc.returncode}): {' '.join(cmd)}\n"
-            f"stdout:\n{proc.stdout}\n"
+            f"stdout:\n{stdout}\n"
             f"stderr:\n{proc.stderr}"
         )
-    return proc.stdout.strip()
+    return stdout.strip()
 
 
 def detect_sdk(sdk: str) -> tuple[str, str]:
-    sdk_path = run(["xcrun", "--show-sdk-path", "--sdk", sdk])
-    sdk_version = run(["xcrun", "--show-sdk-version", "--sdk", sdk])
-    return sdk_path, sdk_version
+    # The two xcrun lookups are independent; overlap them.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        sdk_path = pool.submit(run, ["xcrun", "--show-sdk-path", "--sdk", sdk])
+        sdk_version = pool.submit(run, ["xcrun", "--show-sdk-version", "--sdk", sdk])
+        return sdk_path.result(), sdk_version.result()
 
 
 def normalize_version(version: str) -> str:
@@ -139,8 +178,7 @@ def infer_target(sdk: str, sdk_version: str) -> str:
     return f"arm64-apple-ios{version}"
 
 
-def dump_swiftui_api(sdk: str, target: str, out_file: pathlib.Path) -> None:
-    sdk_path, _ = detect_sdk(sdk)
+def dump_swiftui_api(sdk_path: str, target: str, out_file: pathlib.Path) -> None:
     module_cache_dir = pathlib.Path(tempfile.mkdtemp(prefix="swiftui-digester-cache-"))
     cmd = [
         "swift-api-digester",
@@ -156,44 +194,60 @@ def dump_swiftui_api(sdk: str, target: str, out_file: pathlib.Path) -> None:
         "-o",
         str(out_file),
     ]
-    run(cmd)
-
-
-def walk_swiftui_nodes(node: dict[str, Any], parents: tuple[str, ...] = ()):
-    name = node.get("name", "")
-    next_parents = parents
-    if name:
-        next_parents = parents + (name,)
-
-    decl_kind = node.get("declKind")
-    if decl_kind in TARGET_DECL_KINDS:
-        usr = node.get("usr") or ""
-        if usr and not name.startswith("_"):
-            # Filter most SPI/internal-ish declarations by convention.
-            if "._" not in ".".join(next_parents):
-                yield SwiftUISymbol(
-                    usr=usr,
-                    decl_kind=decl_kind,
-                    name=name,
-                    printed_name=node.get("printedName", name),
-                    module_name=node.get("moduleName", "SwiftUI"),
-                    path=next_parents,
-                )
-
-    for child in node.get("children", []):
-        yield from walk_swiftui_nodes(child, next_parents)
+    # The dump goes to out_file; only stderr is worth keeping for error reports.
+    run(cmd, capture_stdout=False)
+
+
+def walk_swiftui_nodes(root: dict[str, Any]):
+    # Iterative pre-order walk; the digester tree is large and can nest deeply.
+    stack: list[tuple[dict[str, Any], tuple[str, ...]]] = [(root, ())]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, parents = pop()
+        get = node.get
+        name = get("name", "")
+        next_parents = parents + (name,) if name else parents
+
+        decl_kind = get("declKind")
+        if decl_kind in TARGET_DECL_KINDS:
+            usr = get("usr") or ""
+            if usr and not name.startswith("_"):
+                # Filter most SPI/internal-ish declarations by convention.
+                if "._" not in ".".join(next_parents):
+                    yield SwiftUISymbol(
+                        usr=usr,
+                        decl_kind=decl_kind,
+                        name=name,
+                        printed_name=get("printedName", name),
+                        module_name=get("moduleName", "SwiftUI"),
+                        path=next_parents,
+                    )
+
+        children = get("children")
+        if children:
+            for child in reversed(children):
+                push((child, next_parents))
 
 
 def load_swiftui_symbols(swiftui_json: pathlib.Path) -> list[SwiftUISymbol]:
-    data = json.loads(swiftui_json.read_text())
+    raw = swiftui_json.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     root = data.get("ABIRoot")
     if not isinstance(root, dict):
         raise RuntimeError(f"Unexpected digester JSON shape in {swiftui_json}")
 
-    symbols: dict[str, SwiftUISymbol] = {}
+    # Deduplicate by USR; if the digester repeats a USR, the first node in
+    # depth-first order wins.
+    seen: set[str] = set()
+    symbols: list[SwiftUISymbol] = []
     for sym in walk_swiftui_nodes(root):
-        symbols[sym.usr] = sym
-    return sorted(symbols.values(), key=lambda s: (s.decl_kind, s.name, s.usr))
+        if sym.usr in seen:
+            continue
+        seen.add(sym.usr)
+        symbols.append(sym)
+    symbols.sort(key=lambda s: (s.decl_kind, s.name, s.usr))
+    return symbols
 
 
 def extract_manifest_call_bodies(manifest: str, call_name: str) -> list[str]:
@@ -297,20 +351,54 @@ def discover_scannable_target_names(repo_root: pathlib.Path, targets: dict[str,
     return sorted(included)
 
 
-def scan_raven_sources(root: pathlib.Path) -> dict[str, Any]:
-    public_type_pat = re.compile(r"\bpublic\s+(?:final\s+)?(?:struct|class|enum|protocol|actor|typealias)\s+([A-Za-z_][A-Za-z0-9_]*)")
-    type_or_extension_pat = re.compile(r"\b((?:public\s+)?(?:final\s+)?(?:struct|class|enum|protocol|actor|extension))\s+([A-Za-z_][A-Za-z0-9_]*)")
-    public_typealias_pat = re.compile(r"\bpublic\s+typealias\s+([A-Za-z_][A-Za-z0-9_]*)\b")
+# Declaration patterns used by scan_raven_sources, compiled once at import.
+PUBLIC_TYPE_RE = re.compile(r"\bpublic\s+(?:final\s+)?(?:struct|class|enum|protocol|actor|typealias)\s+([A-Za-z_][A-Za-z0-9_]*)")
+TYPE_OR_EXT_RE = re.compile(r"\b((?:public\s+)?(?:final\s+)?(?:struct|class|enum|protocol|actor|extension))\s+([A-Za-z_][A-Za-z0-9_]*)")
+PROTOCOL_FUNC_RE = re.compile(r"\b(?:static\s+|class\s+|mutating\s+|nonmutating\s+)*func\s+`?([A-Za-z_][A-Za-z0-9_]*)`?\b")
+PROTOCOL_VAR_RE = re.compile(r"\b(?:static\s+|class\s+)?var\s+`?([A-Za-z_][A-Za-z0-9_]*)`?\s*:")
+ENUM_CASE_RE = re.compile(r"^\s*(?:public\s+)?(?:indirect\s+)?case\s+(.+)$")
+# Public member declarations fused into one alternation so each line is scanned
+# once; dispatch on `m.lastgroup`. Every branch starts at a `public` keyword and
+# stops at the declared name, so (short of a member literally named `public`)
+# branches never overlap and finditer yields what separate scans would.
+MEMBER_DECL_RE = re.compile(
+    r"(?P<typealias>\bpublic\s+typealias\s+(?P<typealias_name>[A-Za-z_][A-Za-z0-9_]*)\b)"
     # Capture public function names regardless of generic clauses or multiline parameter lists.
-    func_pat = re.compile(r"\bpublic\s+(?:static\s+|class\s+|mutating\s+|nonmutating\s+|override\s+|convenience\s+|required\s+|final\s+)*func\s+`?([A-Za-z_][A-Za-z0-9_]*)`?\b")
-    protocol_func_pat = re.compile(r"\b(?:static\s+|class\s+|mutating\s+|nonmutating\s+)*func\s+`?([A-Za-z_][A-Za-z0-9_]*)`?\b")
-    var_pat = re.compile(r"\bpublic\s+(?:static\s+|class\s+|private\(set\)\s+|internal\(set\)\s+)*var\s+`?([A-Za-z_][A-Za-z0-9_]*)`?\b")
-    let_pat = re.compile(r"\bpublic\s+(?:static\s+|class\s+)*let\s+`?([A-Za-z_][A-Za-z0-9_]*)`?\b")
-    protocol_var_pat = re.compile(r"\b(?:static\s+|class\s+)?var\s+`?([A-Za-z_][A-Za-z0-9_]*)`?\s*:")
-    enum_case_pat = re.compile(r"^\s*(?:public\s+)?(?:indirect\s+)?case\s+(.+)$")
-    subscript_pat = re.compile(r"\bpublic\s+(?:static\s+|class\s+|final\s+)*subscript\b")
-    init_pat = re.compile(r"\bpublic\s+(?:convenience\s+|required\s+|override\s+)*init\b")
-
+    r"|(?P<func>\bpublic\s+(?:static\s+|class\s+|mutating\s+|nonmutating\s+|override\s+|convenience\s+|required\s+|final\s+)*func\s+`?(?P<func_name>[A-Za-z_][A-Za-z0-9_]*)`?\b)"
+    r"|(?P<var>\bpublic\s+(?:static\s+|class\s+|private\(set\)\s+|internal\(set\)\s+)*var\s+`?(?P<var_name>[A-Za-z_][A-Za-z0-9_]*)`?\b)"
+    r"|(?P<let>\bpublic\s+(?:static\s+|class\s+)*let\s+`?(?P<let_name>[A-Za-z_][A-Za-z0-9_]*)`?\b)"
+    r"|(?P<subscript>\bpublic\s+(?:static\s+|class\s+|final\s+)*subscript\b)"
+    r"|(?P<init>\bpublic\s+(?:convenience\s+|required\s+|override\s+)*init\b)"
+)
+PUBLIC_PROTOCOL_HEAD_RE = re.compile(r"\bpublic\s+protocol\b")
+PUBLIC_ENUM_HEAD_RE = re.compile(r"\bpublic\s+enum\b")
+IDENTIFIER_PREFIX_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)")
+# Leading attributes (e.g. `@MainActor public func ...`).
+ATTR_PREFIX_RE = re.compile(r"^\s*(?:@\w+(?:\([^)]*\))?\s*)+")
+
+
+SCAN_RESULT_KEYS = (
+    "type_names",
+    "qualified_type_names",
+    "func_names",
+    "var_names",
+    "qualified_func_names",
+    "qualified_var_names",
+    "constructor_owners",
+)
+
+# Below this many files, process-pool startup costs more than it saves.
+PARALLEL_SCAN_MIN_FILES = 64
+
+
+def owner_from_stack(stack: list[tuple[str, int, bool, bool]]) -> str:
+    if not stack:
+        return ""
+    return ".".join(name for name, _, _, _ in stack)
+
+
+def scan_swift_file(swift_file: pathlib.Path) -> dict[str, set[str]]:
+    """Collect public declaration names from one Swift source file."""
     type_names: set[str] = set()
     qualified_type_names: set[str] = set()
     func_names: set[str] = set()
@@ -319,63 +407,53 @@ def scan_raven_sources(root: pathlib.Path) -> dict[str, Any]:
     qualified_var_names: set[str] = set()
     constructor_owners: set[str] = set()
 
-    def owner_from_stack(stack: list[tuple[str, int, bool, bool]]) -> str:
-        if not stack:
-            return ""
-        return ".".join(name for name, _, _, _ in stack)
-
-    targets = parse_target_manifest(root)
-    target_names = discover_scannable_target_names(root, targets)
-    source_roots = [root / targets[name]["path"] for name in target_names if name in targets]
-    source_roots = sorted(path for path in source_roots if path.exists())
-
-    if not source_roots:
-        fallback = root / "Sources" / "RavenCore"
-        if fallback.exists():
-            source_roots = [fallback]
-
-    swift_files: list[pathlib.Path] = []
-    seen_files: set[pathlib.Path] = set()
-    for source_root in source_roots:
-        for swift_file in source_root.rglob("*.swift"):
-            resolved = swift_file.resolve()
-            if resolved not in seen_files:
-                seen_files.add(resolved)
-                swift_files.append(swift_file)
-
-    for swift_file in sorted(swift_files):
-        text = swift_file.read_text(encoding="utf-8")
-        lines = text.splitlines()
-
-        # Track type/extension lexical scopes with brace depth.
-        brace_depth = 0
-        type_stack: list[tuple[str, int, bool, bool]] = []
-        pending_scope_name: str | None = None
-        pending_scope_is_public_type = False
-        pending_scope_is_public_protocol = False
-        pending_scope_is_public_enum = False
-
-        for raw_line in lines:
+    # Track type/extension lexical scopes with brace depth.
+    brace_depth = 0
+    type_stack: list[tuple[str, int, bool, bool]] = []
+    # Dotted owner path for type_stack; only rebuilt when the stack changes.
+    current_owner = ""
+    pending_scope_name: str | None = None
+    pending_scope_is_public_type = False
+    pending_scope_is_public_protocol = False
+    pending_scope_is_public_enum = False
+
+    # Iterate the file lazily rather than materializing a list of lines.
+    with swift_file.open("r", encoding="utf-8") as fh:
+        for raw_line in fh:
             line = raw_line.split("//", 1)[0]
+            # Cheap prefilter: a line with no braces and no `public` can only matter
+            # if it opens a type/extension scope or lists members of the enclosing
+            # public protocol/enum. Everything else leaves the scan state untouched.
+            if (
+                "{" not in line
+                and "}" not in line
+                and "public" not in line
+                and not (type_stack and (type_stack[-1][2] or type_stack[-1][3]))
+                and TYPE_OR_EXT_RE.search(line) is None
+            ):
+                continue
             # Normalize away leading attributes (e.g. `@MainActor public func ...`),
             # since our declaration regexes operate on the remaining tokens.
-            line = re.sub(r"^\s*(?:@\w+(?:\([^)]*\))?\s*)+", "", line)
+            line = ATTR_PREFIX_RE.sub("", line, count=1)
+            opens = line.count("{")
+            closes = line.count("}")
 
             # Track declaration-scoped owner context.
-            decl = type_or_extension_pat.search(line)
+            decl = TYPE_OR_EXT_RE.search(line)
             if decl:
                 decl_head = decl.group(1)
                 scope_name = decl.group(2)
-                is_public_type = public_type_pat.search(line) is not None
-                is_public_protocol = bool(re.search(r"\bpublic\s+protocol\b", decl_head))
-                is_public_enum = bool(re.search(r"\bpublic\s+enum\b", decl_head))
-                if "{" in line:
-                    future_depth = brace_depth + line.count("{") - line.count("}")
+                is_public_type = PUBLIC_TYPE_RE.search(line) is not None
+                is_public_protocol = PUBLIC_PROTOCOL_HEAD_RE.search(decl_head) is not None
+                is_public_enum = PUBLIC_ENUM_HEAD_RE.search(decl_head) is not None
+                if opens:
+                    future_depth = brace_depth + opens - closes
                     if future_depth > brace_depth:
                         type_stack.append((scope_name, future_depth, is_public_protocol, is_public_enum))
+                        current_owner = qualified_member(current_owner, scope_name)
                     if is_public_type and not scope_name.startswith("_"):
                         type_names.add(scope_name)
-                        qualified_type_names.add(owner_from_stack(type_stack))
+                        qualified_type_names.add(current_owner)
                     pending_scope_name = None
                     pending_scope_is_public_type = False
                     pending_scope_is_public_protocol = False
@@ -386,159 +464,239 @@ def scan_raven_sources(root: pathlib.Path) -> dict[str, Any]:
                     pending_scope_is_public_protocol = is_public_protocol
                     pending_scope_is_public_enum = is_public_enum
 
-            owner = owner_from_stack(type_stack)
+            owner = current_owner
             in_public_protocol = bool(type_stack and type_stack[-1][2])
             in_public_enum = bool(type_stack and type_stack[-1][3])
 
-            # `typealias` declarations are not lexical scopes, so capture them explicitly.
-            # This ensures nested aliases like `DatePicker.Components` are represented.
-            for m in public_typealias_pat.finditer(line):
-                name = m.group(1)
-                if not name.startswith("_"):
-                    type_names.add(name)
+            for m in MEMBER_DECL_RE.finditer(line):
+                kind = m.lastgroup
+                if kind == "func":
+                    name = m.group("func_name")
+                    if not name.startswith("_"):
+                        func_names.add(name)
+                        qualified_func_names.add(qualified_member(owner or "GLOBAL", name))
+                elif kind == "var" or kind == "let":
+                    name = m.group(kind + "_name")
+                    if not name.startswith("_"):
+                        var_names.add(name)
+                        qualified_var_names.add(qualified_member(owner or "GLOBAL", name))
+                elif kind == "typealias":
+                    # `typealias` declarations are not lexical scopes, so capture them explicitly.
+                    # This ensures nested aliases like `DatePicker.Components` are represented.
+                    name = m.group("typealias_name")
+                    if not name.startswith("_"):
+                        type_names.add(name)
+                        if owner:
+                            qualified_type_names.add(qualified_member(owner, name))
+                elif kind == "init":
                     if owner:
-                        qualified_type_names.add(qualified_member(owner, name))
+                        constructor_owners.add(owner)
+                else:  # subscript
+                    var_names.add("subscript")
+                    qualified_var_names.add(qualified_member(owner or "GLOBAL", "subscript"))
 
-            for m in func_pat.finditer(line):
-                name = m.group(1)
-                if not name.startswith("_"):
-                    func_names.add(name)
-                    qualified_func_names.add(qualified_member(owner or "GLOBAL", name))
             if in_public_protocol:
-                for m in protocol_func_pat.finditer(line):
+                for m in PROTOCOL_FUNC_RE.finditer(line):
                     name = m.group(1)
                     if not name.startswith("_"):
                         func_names.add(name)
                         qualified_func_names.add(qualified_member(owner or "GLOBAL", name))
-
-            for m in var_pat.finditer(line):
-                name = m.group(1)
-                if not name.startswith("_"):
-                    var_names.add(name)
-                    qualified_var_names.add(qualified_member(owner or "GLOBAL", name))
-            for m in let_pat.finditer(line):
-                name = m.group(1)
-                if not name.startswith("_"):
-                    var_names.add(name)
-                    qualified_var_names.add(qualified_member(owner or "GLOBAL", name))
             if in_public_protocol:
-                for m in protocol_var_pat.finditer(line):
+                for m in PROTOCOL_VAR_RE.finditer(line):
                     name = m.group(1)
                     if not name.startswith("_"):
                         var_names.add(name)
                         qualified_var_names.add(qualified_member(owner or "GLOBAL", name))
             if in_public_enum:
-                enum_case_match = enum_case_pat.search(line)
+                enum_case_match = ENUM_CASE_RE.search(line)
                 if enum_case_match:
                     case_clause = enum_case_match.group(1)
                     for piece in case_clause.split(","):
                         candidate = piece.strip()
                         if candidate.startswith("indirect "):
                             candidate = candidate[len("indirect "):].strip()
-                        m = re.match(r"([A-Za-z_][A-Za-z0-9_]*)", candidate)
+                        m = IDENTIFIER_PREFIX_RE.match(candidate)
                         if m:
                             name = m.group(1)
                             if not name.startswith("_"):
                                 var_names.add(name)
                                 qualified_var_names.add(qualified_member(owner or "GLOBAL", name))
 
-            if init_pat.search(line) and owner:
-                constructor_owners.add(owner)
-
-            opens = line.count("{")
-            closes = line.count("}")
-
             if pending_scope_name and opens > 0:
                 future_depth = brace_depth + opens - closes
                 if future_depth > brace_depth:
                     type_stack.append((pending_scope_name, future_depth, pending_scope_is_public_protocol, pending_scope_is_public_enum))
+                    current_owner = qualified_member(current_owner, pending_scope_name)
                 if pending_scope_is_public_type and not pending_scope_name.startswith("_"):
                     type_names.add(pending_scope_name)
-                    qualified_type_names.add(owner_from_stack(type_stack))
+                    qualified_type_names.add(current_owner)
                 pending_scope_name = None
                 pending_scope_is_public_type = False
                 pending_scope_is_public_protocol = False
                 pending_scope_is_public_enum = False
 
             brace_depth += opens - closes
-            while type_stack and brace_depth < type_stack[-1][1]:
-                type_stack.pop()
+            if type_stack and brace_depth < type_stack[-1][1]:
+                while type_stack and brace_depth < type_stack[-1][1]:
+                    type_stack.pop()
+                current_owner = owner_from_stack(type_stack)
+
+    return {
+        "type_names": type_names,
+        "qualified_type_names": qualified_type_names,
+        "func_names": func_names,
+        "var_names": var_names,
+        "qualified_func_names": qualified_func_names,
+        "qualified_var_names": qualified_var_names,
+        "constructor_owners": constructor_owners,
+    }
+
+
+def files_without_public_decls(source_roots: list[pathlib.Path]) -> set[pathlib.Path]:
+    """Return Swift files under source_roots that never mention `public`.
+
+    Every declaration scan_swift_file records is introduced by `public`, so such
+    files contribute nothing. The prefilter uses ripgrep when it is installed and
+    returns an empty set otherwise (or on any rg failure), in which case every
+    file is scanned in Python as before.
+    """
+    rg = shutil.which("rg")
+    if rg is None or not source_roots:
+        return set()
+    cmd = [
+        rg,
+        "--files-without-match",
+        "--fixed-strings",
+        "--no-ignore",
+        "--hidden",
+        "--no-messages",
+        "--null",
+        "--glob",
+        "*.swift",
+        "--",
+        "public",
+        *(str(path) for path in source_roots),
+    ]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False)
+    except OSError:
+        return set()
+    # rg exits 1 when no file qualifies; anything else besides 0 is an error.
+    if proc.returncode not in (0, 1):
+        return set()
+    return {
+        pathlib.Path(os.fsdecode(raw)).resolve()
+        for raw in proc.stdout.split(b"\0")
+        if raw
+    }
+
+
+def scan_raven_sources(root: pathlib.Path) -> dict[str, Any]:
+    targets = parse_target_manifest(root)
+    target_names = discover_scannable_target_names(root, targets)
+    source_roots = [root / targets[name]["path"] for name in target_names if name in targets]
+    source_roots = sorted(path for path in source_roots if path.exists())
+
+    if not source_roots:
+        fallback = root / "Sources" / "RavenCore"
+        if fallback.exists():
+            source_roots = [fallback]
+
+    swift_files: list[pathlib.Path] = []
+    seen_files: set[pathlib.Path] = set()
+    for source_root in source_roots:
+        for swift_file in source_root.rglob("*.swift"):
+            resolved = swift_file.resolve()
+            if resolved not in seen_files:
+                seen_files.add(resolved)
+                swift_files.append(swift_file)
 
-            if subscript_pat.search(line):
-                var_names.add("subscript")
-                qualified_var_names.add(qualified_member(owner or "GLOBAL", "subscript"))
+    # Only files ripgrep positively reports as `public`-free are skipped; files it
+    # did not see (ignored, unreadable, ...) still go through the Python scan.
+    skipped_files = files_without_public_decls(source_roots)
+
+    merged: dict[str, set[str]] = {key: set() for key in SCAN_RESULT_KEYS}
+    ordered_files = sorted(
+        swift_file for swift_file in swift_files if swift_file.resolve() not in skipped_files
+    )
+    if len(ordered_files) >= PARALLEL_SCAN_MIN_FILES:
+        # Files scan independently and results merge by set union, so the
+        # output does not depend on worker scheduling.
+        with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            partials = list(pool.map(scan_swift_file, ordered_files, chunksize=8))
+    else:
+        partials = [scan_swift_file(swift_file) for swift_file in ordered_files]
+    for partial in partials:
+        for key in SCAN_RESULT_KEYS:
+            merged[key].update(partial[key])
 
     return {
         "scanned_targets": target_names,
         "source_roots": [str(path.relative_to(root)) for path in source_roots],
         "swift_file_count": len(swift_files),
-        "type_names": sorted(type_names),
-        "qualified_type_names": sorted(qualified_type_names),
-        "func_names": sorted(func_names),
-        "var_names": sorted(var_names),
-        "qualified_func_names": sorted(qualified_func_names),
-        "qualified_var_names": sorted(qualified_var_names),
-        "constructor_owners": sorted(constructor_owners),
+        "type_names": sorted(merged["type_names"]),
+        "qualified_type_names": sorted(merged["qualified_type_names"]),
+        "func_names": sorted(merged["func_names"]),
+        "var_names": sorted(merged["var_names"]),
+        "qualified_func_names": sorted(merged["qualified_func_names"]),
+        "qualified_var_names": sorted(merged["qualified_var_names"]),
+        "constructor_owners": sorted(merged["constructor_owners"]),
     }
 
 
-def owner_match_candidates(owner: str) -> list[str]:
-    """Return owner candidates for matching extension methods that project through wrappers."""
-    candidates = [owner]
-    # SwiftUI often reports extension methods on ModifiedContent/TabContent that are
-    # effectively surfaced from View extensions.
-    owner_aliases: dict[str, tuple[str, ...]] = {
-        "ModifiedContent": ("View",),
-        "TabContent": ("View",),
-    }
-    candidates.extend(owner_aliases.get(owner, ()))
-    return candidates
+# SwiftUI often reports extension methods on ModifiedContent/TabContent that are
+# effectively surfaced from View extensions.
+OWNER_MATCH_ALIASES: dict[str, tuple[str, ...]] = {
+    "ModifiedContent": ("View",),
+    "TabContent": ("View",),
+}
 
 
-def should_allow_name_only_fallback(sym: SwiftUISymbol, owner: str) -> bool:
-    """Allow name-only fallback only for global-ish APIs, not all member APIs."""
-    global_owners = {"", "GLOBAL", "SwiftUI", sym.module_name}
-    return owner in global_owners
+@functools.lru_cache(maxsize=None)
+def owner_match_candidates(owner: str) -> tuple[str, ...]:
+    """Return owner candidates for matching extension methods that project through wrappers."""
+    return (owner, *OWNER_MATCH_ALIASES.get(owner, ()))
 
 
-def is_component_candidate_type(sym: SwiftUISymbol, owner: str) -> bool:
-    """Heuristic filter for top-level SwiftUI component-like types."""
-    if sym.decl_kind not in {"Struct", "Class", "Protocol"}:
-        return False
-    if owner not in {"SwiftUI", sym.module_name}:
-        return False
-    if not sym.name or not sym.name[0].isupper() or sym.name.startswith("_"):
-        return False
+GLOBAL_OWNERS = frozenset({"", "GLOBAL", "SwiftUI"})
 
-    suffixes = (
-        "View",
-        "Button",
-        "Picker",
-        "Field",
-        "Editor",
-        "Stack",
-        "Grid",
-        "List",
-        "Form",
-        "Section",
-        "Group",
-        "Link",
-        "Toggle",
-        "Slider",
-        "Gauge",
-        "Divider",
-        "Label",
-        "Menu",
-        "Sheet",
-        "Alert",
-        "Dialog",
-        "Popover",
-        "Tab",
-        "Navigation",
-        "ScrollView",
-        "Table",
-    )
-    exact = {
+
+def should_allow_name_only_fallback(sym: SwiftUISymbol, owner: str) -> bool:
+    """Allow name-only fallback only for global-ish APIs, not all member APIs."""
+    return owner in GLOBAL_OWNERS or owner == sym.module_name
+
+
+COMPONENT_NAME_SUFFIXES = (
+    "View",
+    "Button",
+    "Picker",
+    "Field",
+    "Editor",
+    "Stack",
+    "Grid",
+    "List",
+    "Form",
+    "Section",
+    "Group",
+    "Link",
+    "Toggle",
+    "Slider",
+    "Gauge",
+    "Divider",
+    "Label",
+    "Menu",
+    "Sheet",
+    "Alert",
+    "Dialog",
+    "Popover",
+    "Tab",
+    "Navigation",
+    "ScrollView",
+    "Table",
+)
+
+COMPONENT_EXACT_NAMES = frozenset(
+    {
         "Text",
         "Image",
         "Color",
@@ -552,42 +710,77 @@ def is_component_candidate_type(sym: SwiftUISymbol, owner: str) -> bool:
         "TimelineView",
         "GeometryReader",
     }
-    return sym.name in exact or sym.name.endswith(suffixes)
+)
+
+
+def is_component_candidate_type(sym: SwiftUISymbol, owner: str) -> bool:
+    """Heuristic filter for top-level SwiftUI component-like types."""
+    if sym.decl_kind not in COMPONENT_DECL_KINDS:
+        return False
+    if owner != "SwiftUI" and owner != sym.module_name:
+        return False
+    if not sym.name or not sym.name[0].isupper() or sym.name.startswith("_"):
+        return False
+    return sym.name in COMPONENT_EXACT_NAMES or sym.name.endswith(COMPONENT_NAME_SUFFIXES)
+
+
+def _match_type(sym: SwiftUISymbol, owner: str, raven: dict[str, Any]) -> bool:
+    if owner and owner != "SwiftUI" and owner != sym.module_name:
+        qualified = qualified_member(owner, sym.name)
+        if qualified in raven["qualified_type_names"]:
+            return True
+    return sym.name in raven["type_names"]
+
+
+def _match_func(sym: SwiftUISymbol, owner: str, raven: dict[str, Any]) -> bool:
+    for candidate_owner in owner_match_candidates(owner or "GLOBAL"):
+        qualified = qualified_member(candidate_owner, sym.name)
+        if qualified in raven["qualified_func_names"]:
+            return True
+    if should_allow_name_only_fallback(sym, owner):
+        return sym.name in raven["func_names"]
+    return False
+
+
+def _match_var(sym: SwiftUISymbol, owner: str, raven: dict[str, Any]) -> bool:
+    for candidate_owner in owner_match_candidates(owner or "GLOBAL"):
+        qualified = qualified_member(candidate_owner, sym.name)
+        if qualified in raven["qualified_var_names"]:
+            return True
+    if should_allow_name_only_fallback(sym, owner):
+        return sym.name in raven["var_names"]
+    return False
+
+
+def _match_constructor(sym: SwiftUISymbol, owner: str, raven: dict[str, Any]) -> bool:
+    # Constructor parity is tracked per owning type context.
+    return owner in raven["constructor_owners"]
+
+
+SYMBOL_MATCHERS = {
+    **{kind: _match_type for kind in TYPE_DECL_KINDS},
+    "Func": _match_func,
+    "Macro": _match_func,
+    "Var": _match_var,
+    "Subscript": _match_var,
+    "Constructor": _match_constructor,
+}
 
 
 def match_symbol(sym: SwiftUISymbol, raven: dict[str, Any]) -> bool | None:
     if not is_actionable_symbol(sym):
         return None
-    owner = owner_context(sym)
-    if sym.decl_kind in TYPE_DECL_KINDS:
-        if owner and owner not in {"SwiftUI", sym.module_name}:
-            qualified = qualified_member(owner, sym.name)
-            if qualified in raven["qualified_type_names"]:
-                return True
-        return sym.name in raven["type_names"]
-    if sym.decl_kind == "Func" or sym.decl_kind == "Macro":
-        for candidate_owner in owner_match_candidates(owner or "GLOBAL"):
-            qualified = qualified_member(candidate_owner, sym.name)
-            if qualified in raven["qualified_func_names"]:
-                return True
-        if should_allow_name_only_fallback(sym, owner):
-            return sym.name in raven["func_names"]
-        return False
-    if sym.decl_kind == "Var" or sym.decl_kind == "Subscript":
-        for candidate_owner in owner_match_candidates(owner or "GLOBAL"):
-            qualified = qualified_member(candidate_owner, sym.name)
-            if qualified in raven["qualified_var_names"]:
-                return True
-        if should_allow_name_only_fallback(sym, owner):
-            return sym.name in raven["var_names"]
+    matcher = SYMBOL_MATCHERS.get(sym.decl_kind)
+    if matcher is None:
         return False
-    if sym.decl_kind == "Constructor":
-        # Constructor parity is tracked per owning type context.
-        return owner in raven["constructor_owners"]
-    return False
+    return matcher(sym, owner_context(sym), raven)
 
 
 def write_json(path: pathlib.Path, payload: Any) -> None:
+    if orjson is not None:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE
+        path.write_bytes(orjson.dumps(payload, option=options, default=list))
+        return
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
 
@@ -596,96 +789,87 @@ def build_report(
     raven: dict[str, Any],
     sdk: str,
     target: str,
+    generated_at: str,
 ) -> dict[str, Any]:
     matched: list[SwiftUISymbol] = []
     missing: list[SwiftUISymbol] = []
     skipped: list[SwiftUISymbol] = []
+    by_kind_total: Counter[str] = Counter()
+    by_kind_missing: Counter[str] = Counter()
+    by_kind_skipped: Counter[str] = Counter()
+
+    # High-signal lists are filled in the same pass that classifies each symbol.
+    # Types/components deduplicate by (name, decl kind, owner) to avoid noisy repeats
+    # with same short names; actionable APIs are named funcs/vars/subscripts only
+    # (operator overloads excluded). Dedup keys are NUL-joined strings (NUL cannot
+    # occur in Swift identifiers) and the first occurrence of each key is kept.
+    type_index: dict[str, dict[str, str]] = {}
+    api_index: dict[str, dict[str, str]] = {}
+    operator_like: list[SwiftUISymbol] = []
+    component_index: dict[str, dict[str, str]] = {}
 
     for sym in swiftui_symbols:
+        kind = sym.decl_kind
+        by_kind_total[kind] += 1
         result = match_symbol(sym, raven)
         if result is None:
             skipped.append(sym)
-        elif result:
-            matched.append(sym)
-        else:
-            missing.append(sym)
-
-    by_kind_total = Counter(sym.decl_kind for sym in swiftui_symbols)
-    by_kind_missing = Counter(sym.decl_kind for sym in missing)
-    by_kind_skipped = Counter(sym.decl_kind for sym in skipped)
-    scoreable_total = len(swiftui_symbols) - len(skipped)
-
-    # High-signal list: public type-like symbols likely to be user-facing components.
-    # Deduplicate by (name, decl kind, owner) to avoid noisy repeats with same short names.
-    type_seen: set[tuple[str, str, str]] = set()
-    missing_types: list[dict[str, str]] = []
-    for s in missing:
-        if s.decl_kind not in TYPE_DECL_KINDS:
-            continue
-        if not s.name or not s.name[0].isupper() or s.name.startswith("_"):
+            by_kind_skipped[kind] += 1
             continue
-        owner = owner_context(s)
-        key = (s.name, s.decl_kind, owner)
-        if key in type_seen:
+        if result:
+            matched.append(sym)
             continue
-        type_seen.add(key)
-        missing_types.append(
-            {
-                "name": s.name,
-                "printed_name": s.printed_name,
-                "decl_kind": s.decl_kind,
-                "owner": owner,
-                "usr": s.usr,
-            }
-        )
-    missing_types.sort(key=lambda x: (x["name"], x["owner"], x["decl_kind"]))
 
-    # Actionable API list: named funcs/vars/subscripts only (operator overloads excluded).
-    api_seen: set[tuple[str, str, str, str]] = set()
-    missing_apis_actionable: list[dict[str, str]] = []
-    operator_like: list[SwiftUISymbol] = []
-    for s in missing:
-        if s.decl_kind not in {"Func", "Var", "Subscript"}:
-            continue
-        if is_named_api(s):
-            owner = owner_context(s)
-            key = (s.name, s.printed_name, s.decl_kind, owner)
-            if key in api_seen:
-                continue
-            api_seen.add(key)
-            missing_apis_actionable.append(
-                {
-                    "name": s.name,
-                    "printed_name": s.printed_name,
-                    "decl_kind": s.decl_kind,
+        missing.append(sym)
+        by_kind_missing[kind] += 1
+        owner = owner_context(sym)
+
+        if kind in TYPE_DECL_KINDS:
+            if sym.name and sym.name[0].isupper() and not sym.name.startswith("_"):
+                key = f"{sym.name}\0{kind}\0{owner}"
+                if key not in type_index:
+                    type_index[key] = {
+                        "name": sym.name,
+                        "printed_name": sym.printed_name,
+                        "decl_kind": kind,
+                        "owner": owner,
+                        "usr": sym.usr,
+                    }
+        elif kind in NAMED_API_DECL_KINDS:
+            if is_named_api(sym):
+                api_key = f"{sym.name}\0{sym.printed_name}\0{kind}\0{owner}"
+                if api_key not in api_index:
+                    api_index[api_key] = {
+                        "name": sym.name,
+                        "printed_name": sym.printed_name,
+                        "decl_kind": kind,
+                        "owner": owner,
+                        "usr": sym.usr,
+                    }
+            else:
+                operator_like.append(sym)
+
+        if is_component_candidate_type(sym, owner):
+            key = f"{sym.name}\0{kind}\0{owner}"
+            if key not in component_index:
+                component_index[key] = {
+                    "name": sym.name,
+                    "printed_name": sym.printed_name,
+                    "decl_kind": kind,
                     "owner": owner,
-                    "usr": s.usr,
+                    "usr": sym.usr,
                 }
-            )
-        else:
-            operator_like.append(s)
-    missing_apis_actionable.sort(key=lambda x: (x["name"], x["owner"], x["printed_name"]))
-
-    missing_components: list[dict[str, str]] = []
-    component_seen: set[tuple[str, str, str]] = set()
-    for s in missing:
-        owner = owner_context(s)
-        if not is_component_candidate_type(s, owner):
-            continue
-        key = (s.name, s.decl_kind, owner)
-        if key in component_seen:
-            continue
-        component_seen.add(key)
-        missing_components.append(
-            {
-                "name": s.name,
-                "printed_name": s.printed_name,
-                "decl_kind": s.decl_kind,
-                "owner": owner,
-                "usr": s.usr,
-            }
-        )
-    missing_components.sort(key=lambda x: (x["name"], x["owner"], x["decl_kind"]))
+
+    scoreable_total = len(swiftui_symbols) - len(skipped)
+    missing_types = sorted(
+        type_index.values(), key=lambda x: (x["name"], x["owner"], x["decl_kind"])
+    )
+    missing_apis_actionable = sorted(
+        api_index.values(), key=lambda x: (x["name"], x["owner"], x["printed_name"])
+    )
+    missing_components = sorted(
+        component_index.values(), key=lambda x: (x["name"], x["owner"], x["decl_kind"])
+    )
 
     op_counts = Counter(s.printed_name for s in operator_like)
     operator_like_top = [
@@ -694,7 +878,7 @@ def build_report(
     ]
 
     return {
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "generated_at_utc": generated_at,
         "source_of_truth": {
             "swiftui_module": "SwiftUI",
             "extraction_tool": "swift-api-digester",
@@ -722,17 +906,7 @@ def build_report(
                 "count": len(operator_like),
                 "top_signatures": operator_like_top,
             },
-            "all": [
-                {
-                    "decl_kind": s.decl_kind,
-                    "name": s.name,
-                    "printed_name": s.printed_name,
-                    "usr": s.usr,
-                    "module_name": s.module_name,
-                    "path": list(s.path),
-                }
-                for s in missing
-            ],
+            "all": [s.to_dict() for s in missing],
         },
     }
 
@@ -745,69 +919,70 @@ def write_markdown(report: dict[str, Any], out_path: pathlib.Path) -> None:
     operator_like = report["missing"]["operator_like"]
     src = report["source_of_truth"]
 
-    lines: list[str] = []
-    lines.append("# SwiftUI API Gap Report")
-    lines.append("")
-    lines.append(f"Generated: `{report['generated_at_utc']}`")
-    lines.append(f"Source module: `{src['swiftui_module']}` via `{src['extraction_tool']}`")
-    lines.append(f"SDK: `{src['sdk']}`")
-    lines.append(f"Target: `{src['target']}`")
-    lines.append("")
-    lines.append("## Summary")
-    lines.append("")
-    lines.append(f"- SwiftUI symbols analyzed: **{summary['swiftui_symbol_count']}**")
-    lines.append(f"- Scoreable symbols: **{summary['scoreable_symbol_count']}**")
-    lines.append(f"- Skipped symbols (currently unscored): **{summary['skipped_symbol_count']}**")
-    lines.append(f"- Matched by Raven: **{summary['matched_symbol_count']}**")
-    lines.append(f"- Missing in Raven: **{summary['missing_symbol_count']}**")
-    lines.append(f"- Name-based coverage: **{summary['coverage_percent']}%**")
-    lines.append("")
-    lines.append("### Missing by Declaration Kind")
-    lines.append("")
-    lines.append("| Decl Kind | Missing | Skipped | Total |")
-    lines.append("| --- | ---: | ---: | ---: |")
+    buf = io.StringIO()
+    w = buf.write
+    w("# SwiftUI API Gap Report\n")
+    w("\n")
+    w(f"Generated: `{report['generated_at_utc']}`\n")
+    w(f"Source module: `{src['swiftui_module']}` via `{src['extraction_tool']}`\n")
+    w(f"SDK: `{src['sdk']}`\n")
+    w(f"Target: `{src['target']}`\n")
+    w("\n")
+    w("## Summary\n")
+    w("\n")
+    w(f"- SwiftUI symbols analyzed: **{summary['swiftui_symbol_count']}**\n")
+    w(f"- Scoreable symbols: **{summary['scoreable_symbol_count']}**\n")
+    w(f"- Skipped symbols (currently unscored): **{summary['skipped_symbol_count']}**\n")
+    w(f"- Matched by Raven: **{summary['matched_symbol_count']}**\n")
+    w(f"- Missing in Raven: **{summary['missing_symbol_count']}**\n")
+    w(f"- Name-based coverage: **{summary['coverage_percent']}%**\n")
+    w("\n")
+    w("### Missing by Declaration Kind\n")
+    w("\n")
+    w("| Decl Kind | Missing | Skipped | Total |\n")
+    w("| --- | ---: | ---: | ---: |\n")
 
     for kind, total in summary["by_decl_kind_total"].items():
         miss = summary["by_decl_kind_missing"].get(kind, 0)
         skipped = summary["by_decl_kind_skipped"].get(kind, 0)
-        lines.append(f"| `{kind}` | {miss} | {skipped} | {total} |")
+        w(f"| `{kind}` | {miss} | {skipped} | {total} |\n")
 
-    lines.append("")
-    lines.append("## Missing High-Signal UI Components (first 200)")
-    lines.append("")
+    w("\n")
+    w("## Missing High-Signal UI Components (first 200)\n")
+    w("\n")
     for item in missing_components[:200]:
-        lines.append(f"- `{item['name']}` ({item['decl_kind']}, owner: `{item['owner']}`)")
+        w(f"- `{item['name']}` ({item['decl_kind']}, owner: `{item['owner']}`)\n")
 
-    lines.append("")
-    lines.append("## Missing High-Signal Types (first 200)")
-    lines.append("")
+    w("\n")
+    w("## Missing High-Signal Types (first 200)\n")
+    w("\n")
     for item in missing_types[:200]:
-        lines.append(f"- `{item['name']}` ({item['decl_kind']}, owner: `{item['owner']}`)")
+        w(f"- `{item['name']}` ({item['decl_kind']}, owner: `{item['owner']}`)\n")
 
-    lines.append("")
-    lines.append("## Missing High-Signal Named APIs (first 300)")
-    lines.append("")
+    w("\n")
+    w("## Missing High-Signal Named APIs (first 300)\n")
+    w("\n")
     for item in missing_apis[:300]:
-        lines.append(f"- `{item['printed_name']}` (owner: `{item['owner']}`)")
-
-    lines.append("")
-    lines.append("## Operator-Like API Gap Summary")
-    lines.append("")
-    lines.append(f"- Total operator-like missing APIs: **{operator_like['count']}**")
-    lines.append("")
-    lines.append("### Top Operator-Like Signatures (first 50)")
-    lines.append("")
+        w(f"- `{item['printed_name']}` (owner: `{item['owner']}`)\n")
+
+    w("\n")
+    w("## Operator-Like API Gap Summary\n")
+    w("\n")
+    w(f"- Total operator-like missing APIs: **{operator_like['count']}**\n")
+    w("\n")
+    w("### Top Operator-Like Signatures (first 50)\n")
+    w("\n")
     for item in operator_like["top_signatures"][:50]:
-        lines.append(f"- `{item['signature']}` (x{item['count']})")
+        w(f"- `{item['signature']}` (x{item['count']})\n")
 
-    lines.append("")
-    lines.append("## Notes")
-    lines.append("")
-    lines.append(f"- {src['matching_note']}")
-    lines.append(f"- {src['matching_note_detail']}")
-    lines.append("- This report is deterministic for a given Xcode + SDK version and target triple.")
+    w("\n")
+    w("## Notes\n")
+    w("\n")
+    w(f"- {src['matching_note']}\n")
+    w(f"- {src['matching_note_detail']}\n")
+    w("- This report is deterministic for a given Xcode + SDK version and target triple.\n")
 
-    out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    out_path.write_text(buf.getvalue(), encoding="utf-8")
 
 
 def main() -> int:
@@ -826,6 +1001,8 @@ def main() -> int:
         help="Use an existing swift-api-digester JSON dump instead of extracting",
     )
     args = parser.parse_args()
+    # One timestamp describes the whole run and is shared by every artifact.
+    generated_at = datetime.now(timezone.utc).isoformat()
 
     repo_root = pathlib.Path(args.repo_root).resolve()
     out_dir = (repo_root / args.output_dir).resolve()
@@ -841,25 +1018,27 @@ def main() -> int:
     else:
         tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix="swiftui-digester-"))
         swiftui_json = tmp_dir / "SwiftUI.json"
-        dump_swiftui_api(args.sdk, target, swiftui_json)
+        dump_swiftui_api(sdk_path, target, swiftui_json)
 
     swiftui_symbols = load_swiftui_symbols(swiftui_json)
     raven_inventory = scan_raven_sources(repo_root)
 
-    report = build_report(swiftui_symbols, raven_inventory, sdk=args.sdk, target=target)
+    report = build_report(
+        swiftui_symbols, raven_inventory, sdk=args.sdk, target=target, generated_at=generated_at
+    )
 
     swiftui_payload = {
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "generated_at_utc": generated_at,
         "sdk": args.sdk,
         "sdk_path": sdk_path,
         "sdk_version": sdk_version,
         "target": target,
         "symbol_count": len(swiftui_symbols),
-        "symbols": [dataclasses.asdict(s) for s in swiftui_symbols],
+        "symbols": [s.to_dict() for s in swiftui_symbols],
     }
 
     raven_payload = {
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "generated_at_utc": generated_at,
         "source": "Library products + transitive target dependencies",
         **raven_inventory,
     }
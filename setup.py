@@ -22,7 +22,6 @@ setup(
     install_requires=[
         "click>=8.0.0",
         "flask>=3.0.0",
-        "flask-cors>=4.0.0",
         "watchdog>=3.0.0",
     ],
     entry_points={